@@ -1 +1,6 @@
-# FastAPI backend for MedRAG integration
\ No newline at end of file
+# FastAPI backend for MedRAG integration
+from dotenv import load_dotenv
+
+# Load backend/.env before any app module reads settings at import time
+# (db URL, SMTP, Airflow, CORS); `uvicorn app.main:app` does not go through run.py
+load_dotenv()
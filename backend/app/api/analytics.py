@@ -1,41 +1,63 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, List
 
-from ..core.vector_store import VectorStore
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from ..core.db import get_db
+from ..core.log_buffer import QUERY_EVENT_RETENTION, query_log_buffer
+from ..core.vector_store import cached_stats
 from ..core.qa_engine import QAEngine
 from ..models.schemas import AnalyticsResponse, HealthResponse
+from ..models.tables import QueryEvent
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 # Initialize components
-vector_store = VectorStore()
 qa_engine = QAEngine()
 
-# In-memory storage for analytics (in production, use a proper database)
-query_log: List[Dict] = []
-document_stats: Dict = {}
+# Query metrics cover this trailing window of persisted query events (also their retention)
+STATS_WINDOW = QUERY_EVENT_RETENTION
+
+
+def _query_aggregates(db: Session) -> dict:
+    """Aggregate query events from the stats window in a single SQL statement."""
+    row = db.execute(
+        select(
+            func.count(QueryEvent.id),
+            func.sum(case((QueryEvent.success, 1), else_=0)),
+            func.avg(QueryEvent.response_time),
+            func.avg(case((QueryEvent.response_time > 0, QueryEvent.response_time))),
+            func.sum(QueryEvent.tokens_used),
+        ).where(QueryEvent.ts >= datetime.utcnow() - STATS_WINDOW)
+    ).one()
+    total, successes, avg_rt, avg_rt_measured, tokens = row
+    return {
+        "total": total or 0,
+        "successes": successes or 0,
+        "avg_response_time": avg_rt or 0,
+        "avg_measured_response_time": avg_rt_measured or 0,
+        "tokens": tokens or 0,
+    }
 
 @router.get("/overview", response_model=AnalyticsResponse)
-async def get_analytics_overview():
+def get_analytics_overview(db: Session = Depends(get_db)):
     """
     Get comprehensive analytics overview for the admin dashboard.
     """
     try:
         # Get vector store stats
-        vector_stats = vector_store.get_collection_stats()
+        vector_stats = cached_stats()
         
-        # Calculate metrics from query log
-        total_queries = len(query_log)
-        successful_queries = len([q for q in query_log if q.get("success", False)])
-        success_rate = (successful_queries / total_queries * 100) if total_queries > 0 else 0
-        
-        # Calculate average response time
-        response_times = [q.get("response_time", 0) for q in query_log if q.get("response_time")]
-        avg_response_time = sum(response_times) / len(response_times) if response_times else 0
+        # Calculate metrics from persisted query events
+        agg = _query_aggregates(db)
+        total_queries = agg["total"]
+        success_rate = (agg["successes"] / total_queries * 100) if total_queries > 0 else 0
+        avg_response_time = agg["avg_measured_response_time"]
         
         # Get popular queries (mock data for now)
         popular_queries = [
@@ -60,18 +82,35 @@ async def get_analytics_overview():
         raise HTTPException(status_code=500, detail=f"Failed to get analytics: {str(e)}")
 
 @router.get("/queries")
-async def get_query_logs(limit: int = 50):
+def get_query_logs(limit: int = 50, db: Session = Depends(get_db)):
     """
     Get recent query logs for monitoring.
     """
     try:
-        # Return most recent queries
-        recent_queries = query_log[-limit:] if len(query_log) > limit else query_log
-        recent_queries.reverse()  # Most recent first
+        # Return most recent queries from the stats window first
+        since = datetime.utcnow() - STATS_WINDOW
+        rows = db.execute(
+            select(QueryEvent)
+            .where(QueryEvent.ts >= since)
+            .order_by(QueryEvent.ts.desc(), QueryEvent.id.desc())
+            .limit(max(limit, 0))
+        ).scalars().all()
+        recent_queries = [
+            {
+                "timestamp": r.ts.isoformat(),
+                "query": r.query,
+                "response_time": r.response_time,
+                "success": r.success,
+                "tokens_used": r.tokens_used,
+                "sources_count": r.sources_count,
+            }
+            for r in rows
+        ]
+        total = db.execute(select(func.count(QueryEvent.id)).where(QueryEvent.ts >= since)).scalar_one()
         
         return {
             "queries": recent_queries,
-            "total": len(query_log),
+            "total": total,
             "showing": len(recent_queries)
         }
         
@@ -85,12 +124,13 @@ async def get_system_health():
     Get comprehensive system health information.
     """
     try:
-        vector_stats = vector_store.get_collection_stats()
+        # Collection stats hit Chroma; the model info is an in-memory copy
+        vector_stats = await asyncio.to_thread(cached_stats)
         qa_info = qa_engine.get_model_info()
         
         # Determine overall system status
         status = "healthy"
-        if not qa_engine.is_available():
+        if not qa_info["api_configured"]:
             status = "degraded"
         if vector_stats.get("total_documents", 0) == 0:
             status = "warning" if status == "healthy" else status
@@ -107,27 +147,25 @@ async def get_system_health():
         logger.error(f"Error getting system health: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
+async def record_query(query_data: dict) -> None:
+    """Buffer a query event; it is persisted by the next bulk flush."""
+    query_log_buffer.add({
+        "ts": datetime.utcnow(),
+        "query": query_data.get("query") or "",
+        "response_time": query_data.get("response_time") or 0,
+        "success": bool(query_data.get("success", False)),
+        "tokens_used": query_data.get("tokens_used") or 0,
+        "sources_count": query_data.get("sources_count") or 0,
+    })
+
 @router.post("/log-query")
 async def log_query(query_data: dict):
     """
     Log a query for analytics purposes.
-    This would be called by the chat endpoint to track usage.
+    Chat queries are logged server-side; this endpoint is kept for other clients.
     """
     try:
-        query_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "query": query_data.get("query", ""),
-            "response_time": query_data.get("response_time", 0),
-            "success": query_data.get("success", False),
-            "tokens_used": query_data.get("tokens_used", 0),
-            "sources_count": query_data.get("sources_count", 0)
-        }
-        
-        query_log.append(query_entry)
-        
-        # Keep only last 1000 entries to prevent memory issues
-        if len(query_log) > 1000:
-            query_log.pop(0)
+        await record_query(query_data)
         
         return {"message": "Query logged successfully"}
         
@@ -136,20 +174,21 @@ async def log_query(query_data: dict):
         raise HTTPException(status_code=500, detail=f"Failed to log query: {str(e)}")
 
 @router.get("/stats")
-async def get_detailed_stats():
+def get_detailed_stats(db: Session = Depends(get_db)):
     """
     Get detailed system statistics.
     """
     try:
-        vector_stats = vector_store.get_collection_stats()
+        vector_stats = cached_stats()
         
-        # Query statistics
+        # Query statistics over the stats window
+        agg = _query_aggregates(db)
         query_stats = {
-            "total_queries": len(query_log),
-            "successful_queries": len([q for q in query_log if q.get("success", False)]),
-            "failed_queries": len([q for q in query_log if not q.get("success", False)]),
-            "avg_response_time": sum([q.get("response_time", 0) for q in query_log]) / len(query_log) if query_log else 0,
-            "total_tokens_used": sum([q.get("tokens_used", 0) for q in query_log])
+            "total_queries": agg["total"],
+            "successful_queries": agg["successes"],
+            "failed_queries": agg["total"] - agg["successes"],
+            "avg_response_time": agg["avg_response_time"],
+            "total_tokens_used": agg["tokens"]
         }
         
         return {
@@ -4,9 +4,10 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from passlib.hash import pbkdf2_sha256
 from pydantic import BaseModel
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from ..core.db import Base, engine, get_db
+from ..core.db import get_db
 from ..models.tables import User
 
 logger = logging.getLogger(__name__)
@@ -24,36 +25,38 @@ class LoginResponse(BaseModel):
     role: str
 
 
-def _ensure_tables():
-    Base.metadata.create_all(bind=engine)
+_demo_users = [
+    ("ahmed.elsadek@linkdev.com", "staff"),
+    ("manager@linkdev.com", "manager"),
+    ("employee@linkdev.com", "employee"),
+    ("staff@linkdev.com", "staff"),
+]
+# Hashed once at import; PBKDF2 is deliberately slow
+_demo_hash = pbkdf2_sha256.hash("123456789")
+_seeded = False
 
 
 def seed_demo_user(db: Session):
-    # Seed or update demo users (ensure known password hash algorithm)
-    demo_users = [
-        ("ahmed.elsadek@linkdev.com", "staff"),
-        ("manager@linkdev.com", "manager"),
-        ("employee@linkdev.com", "employee"),
-        ("staff@linkdev.com", "staff"),
-    ]
-    for email, role in demo_users:
-        email_l = email.lower()
-        user = db.query(User).filter(User.email == email_l).first()
-        if not user:
-            user = User(email=email_l, password_hash=pbkdf2_sha256.hash("123456789"), role=role)
-            db.add(user)
-        else:
-            # Force-set to PBKDF2 so logins work even if old bcrypt hash exists
-            user.password_hash = pbkdf2_sha256.hash("123456789")
-            user.role = role
-            # Normalize existing emails to lowercase
-            user.email = email_l
+    # Seed or update demo users once per process (ensure known password hash algorithm)
+    global _seeded
+    if _seeded:
+        return
+
+    # Single bulk upsert; force-set to PBKDF2 so logins work even if old bcrypt hash exists
+    stmt = sqlite_insert(User).values(
+        [{"email": email.lower(), "password_hash": _demo_hash, "role": role} for email, role in _demo_users]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.email],
+        set_={"password_hash": stmt.excluded.password_hash, "role": stmt.excluded.role},
+    )
+    db.execute(stmt)
     db.commit()
+    _seeded = True
 
 
 @router.post("/login", response_model=LoginResponse)
 def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    _ensure_tables()
     seed_demo_user(db)
 
     email_norm = payload.email.strip().lower()
@@ -1,41 +1,106 @@
+import asyncio
 import logging
+import re
 import time
+from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from langchain.schema import Document
+from sqlalchemy import or_, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
 
 from ..core.db import get_db
 from ..core.qa_engine import QAEngine
-from ..core.vector_store import VectorStore
+from ..core.vector_store import cached_stats, vector_store
 from ..models.schemas import ChatRequest, ChatResponse
-from ..models.tables import FAQ
+from ..models.tables import FAQ, FAQ_FTS_TABLE
+from .analytics import record_query
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 # Initialize components
-vector_store = VectorStore()
 qa_engine = QAEngine()
 
+NO_CONTEXT_ANSWER = (
+    "I don't have any relevant information in my knowledge base to answer your question. "
+    "Please try rephrasing your question or ensure that relevant documents have been uploaded."
+)
+
+# FAQ search terms: word tokens of 3+ characters
+_TOKEN_RE = re.compile(r"\w{3,}")
+
+
+def _search_faqs_fts(db: Session, terms: List[str], limit: int):
+    # Prefix-match each term, OR-ed together, ranked by bm25
+    match = " OR ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+    ids = db.execute(
+        text(f"SELECT rowid FROM {FAQ_FTS_TABLE} WHERE {FAQ_FTS_TABLE} MATCH :q ORDER BY rank LIMIT :limit"),
+        {"q": match, "limit": limit},
+    ).scalars().all()
+    if not ids:
+        return []
+    rows = {r.id: r for r in db.query(FAQ).filter(FAQ.id.in_(ids))}
+    return [rows[i] for i in ids if i in rows]
+
+
 def _search_faqs(db: Session, query: str, limit: int = 3):
-    terms = [t for t in query.split() if len(t) > 2][:4]
+    terms = _TOKEN_RE.findall(query)[:4]
     if not terms:
         return []
+    if db.get_bind().dialect.name == "sqlite":
+        try:
+            return _search_faqs_fts(db, terms, limit)
+        except OperationalError:
+            # FTS5 table missing (e.g. SQLite built without FTS5); use LIKE scan
+            db.rollback()
     q = db.query(FAQ)
     # simple OR match across terms
-    from sqlalchemy import or_
-    filters = []
-    for t in terms:
-        like = f"%{t}%"
-        filters.append(FAQ.question.ilike(like))
-        filters.append(FAQ.answer.ilike(like))
-    q = q.filter(or_(*filters)).order_by(FAQ.updated_at.desc()).limit(limit)
+    filters = [col.ilike(f"%{t}%") for t in terms for col in (FAQ.question, FAQ.answer)]
+    q = q.filter(or_(*filters)).order_by(FAQ.updated_at.desc(), FAQ.id.desc()).limit(limit)
     return q.all()
 
 
+def _retrieve_contexts(db: Session, request: ChatRequest) -> List[Document]:
+    # Retrieve relevant documents from vector DB
+    relevant_docs = vector_store.retrieve(
+        query=request.query, 
+        top_k=request.max_results or 5
+    )
+    # Retrieve relevant structured FAQs and inject into contexts
+    try:
+        faq_rows = _search_faqs(db, request.query, limit=3)
+        if faq_rows:
+            faq_docs = [
+                Document(
+                    page_content=f"FAQ Q: {r.question}\nFAQ A: {r.answer}",
+                    metadata={"source": f"FAQ:{r.id}", "category": r.category or "FAQ"},
+                )
+                for r in faq_rows
+            ]
+            relevant_docs = (faq_docs + relevant_docs)[: (request.max_results or 5)]
+    except Exception:
+        pass
+    return relevant_docs
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+
 @router.post("/query", response_model=ChatResponse)
-async def query_documents(request: ChatRequest, db: Session = Depends(get_db)):
+async def query_documents(
+    request: ChatRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """
     Process a user query and return an AI-generated answer based on the document collection.
     """
@@ -53,43 +118,35 @@ async def query_documents(request: ChatRequest, db: Session = Depends(get_db)):
                 detail="AI service unavailable. Please ensure OPENAI_API_KEY is configured."
             )
         
-        # Retrieve relevant documents from vector DB
-        relevant_docs = vector_store.retrieve(
-            query=request.query, 
-            top_k=request.max_results or 5
-        )
-        # Retrieve relevant structured FAQs and inject into contexts
-        try:
-            faq_rows = _search_faqs(db, request.query, limit=3)
-            if faq_rows:
-                from langchain.schema import Document
-                faq_docs = [
-                    Document(
-                        page_content=f"FAQ Q: {r.question}\nFAQ A: {r.answer}",
-                        metadata={"source": f"FAQ:{r.id}", "category": r.category or "FAQ"},
-                    )
-                    for r in faq_rows
-                ]
-                relevant_docs = (faq_docs + relevant_docs)[: (request.max_results or 5)]
-        except Exception:
-            pass
+        # Query embedding, Chroma and FTS lookups are blocking; keep them off the event loop
+        relevant_docs = await run_in_threadpool(_retrieve_contexts, db, request)
         
         if not relevant_docs:
-            return ChatResponse(
-                answer="I don't have any relevant information in my knowledge base to answer your question. Please try rephrasing your question or ensure that relevant documents have been uploaded.",
+            response = ChatResponse(
+                answer=NO_CONTEXT_ANSWER,
                 sources=[],
                 context_count=0,
                 model_used=qa_engine.model,
                 tokens_used=0
             )
-        
-        # Generate answer using QA engine
-        result = qa_engine.answer_question(request.query, relevant_docs)
+        else:
+            # Generate answer using QA engine
+            result = await qa_engine.answer_question(request.query, relevant_docs)
+            response = ChatResponse(**result)
         
         processing_time = time.time() - start_time
         logger.info(f"Processed query in {processing_time:.2f}s: {request.query[:50]}...")
         
-        return ChatResponse(**result)
+        # Record analytics after the response has been sent
+        background_tasks.add_task(record_query, {
+            "query": request.query,
+            "response_time": processing_time,
+            "success": response.error is None,
+            "tokens_used": response.tokens_used or 0,
+            "sources_count": len(response.sources),
+        })
+        
+        return response
         
     except HTTPException:
         raise
@@ -97,17 +154,79 @@ async def query_documents(request: ChatRequest, db: Session = Depends(get_db)):
         logger.error(f"Error processing query '{request.query}': {str(e)}")
         raise HTTPException(status_code=500, detail=f"Query processing failed: {str(e)}")
 
+@router.post("/stream")
+async def stream_query(
+    request: ChatRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Same as /query, but streams the answer as Server-Sent Events.
+    Emits `token` events ({"text": ...}) as the model generates them, then a
+    final `done` event with sources and token usage (or an `error` event).
+    """
+    start_time = time.time()
+    
+    if not request.query.strip():
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    
+    if not qa_engine.is_available():
+        raise HTTPException(
+            status_code=503, 
+            detail="AI service unavailable. Please ensure OPENAI_API_KEY is configured."
+        )
+    
+    try:
+        # Query embedding, Chroma and FTS lookups are blocking; keep them off the event loop
+        relevant_docs = await run_in_threadpool(_retrieve_contexts, db, request)
+    except Exception as e:
+        logger.error(f"Error processing query '{request.query}': {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Query processing failed: {str(e)}")
+    
+    sources = list(dict.fromkeys(doc.metadata.get("source", "Unknown") for doc in relevant_docs))
+    # Filled in while streaming; recorded once the response has been sent
+    log_entry = {"query": request.query, "success": False, "tokens_used": 0, "sources_count": len(sources)}
+    
+    async def events():
+        usage: dict = {}
+        try:
+            if not relevant_docs:
+                yield _sse("token", {"text": NO_CONTEXT_ANSWER})
+            else:
+                async for fragment in qa_engine.answer_question_stream(request.query, relevant_docs, usage):
+                    yield _sse("token", {"text": fragment})
+            log_entry["success"] = True
+            log_entry["tokens_used"] = usage.get("total_tokens") or 0
+            yield _sse("done", {
+                "sources": sources,
+                "context_count": len(relevant_docs),
+                "model_used": qa_engine.model,
+                "tokens_used": usage.get("total_tokens", 0),
+            })
+        except Exception as e:
+            logger.error(f"Error streaming answer for '{request.query}': {str(e)}")
+            yield _sse("error", {"error": str(e)})
+        finally:
+            log_entry["response_time"] = time.time() - start_time
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(record_query, log_entry),
+    )
+
 @router.get("/health")
 async def chat_health():
     """
     Check the health of the chat service components.
     """
     try:
-        vector_stats = vector_store.get_collection_stats()
+        # Collection stats hit Chroma; the model info is an in-memory copy
+        vector_stats = await asyncio.to_thread(cached_stats)
         qa_info = qa_engine.get_model_info()
         
         return {
-            "status": "healthy" if qa_engine.is_available() else "degraded",
+            "status": "healthy" if qa_info["api_configured"] else "degraded",
             "vector_store": vector_stats,
             "qa_engine": qa_info,
             "available_documents": vector_stats.get("total_documents", 0)
@@ -121,7 +240,7 @@ async def chat_health():
         }
 
 @router.post("/test")
-async def test_query():
+async def test_query(background_tasks: BackgroundTasks):
     """
     Test endpoint to verify the chat system is working.
     """
@@ -131,7 +250,7 @@ async def test_query():
     )
     
     try:
-        response = await query_documents(test_request)
+        response = await query_documents(test_request, background_tasks)
         return {
             "test_status": "success",
             "response": response
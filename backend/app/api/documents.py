@@ -1,16 +1,25 @@
+import asyncio
 import logging
+import multiprocessing
+import os
+import shutil
 import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Set
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
 
+from ..core.db import SessionLocal, get_db
 from ..core.document_processor import DocumentProcessor
-from ..core.orchestrator import Orchestrator
-from ..core.vector_store import VectorStore
-from ..models.schemas import DocumentInfo, DocumentUploadResponse
+from ..core.orchestrator import orchestrator
+from ..core.vector_store import cached_stats, vector_store
+from ..models.schemas import DocumentInfo, DocumentJobResponse
+from ..models.tables import IngestJob
 
 logger = logging.getLogger(__name__)
 
@@ -18,18 +27,103 @@ router = APIRouter()
 
 # Initialize components
 document_processor = DocumentProcessor()
-vector_store = VectorStore()
-orchestrator = Orchestrator()
+
+# Text extraction is CPU-bound pure Python; run it in worker processes so
+# parsing a large PDF does not stall the event loop. "spawn" keeps the workers
+# free of the parent's loaded models and threads. Every API worker has its own
+# pool, so it is capped (EXTRACT_WORKERS) rather than sized to the CPU count.
+EXTRACT_POOL = ProcessPoolExecutor(
+    max_workers=max(int(os.getenv("EXTRACT_WORKERS") or min(4, os.cpu_count() or 1)), 1),
+    mp_context=multiprocessing.get_context("spawn"),
+)
+
+# Background tasks processing uploads in this worker; job status lives in the ingest_jobs table
+_ingest_tasks: Set[asyncio.Task] = set()
 
 # Upload directory
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
-@router.post("/upload", response_model=DocumentUploadResponse)
+# Uploads are copied to disk in 1 MB chunks rather than read into memory
+_COPY_CHUNK_SIZE = 1 << 20
+
+
+def _save_upload(src, dest: Path) -> int:
+    """Stream an uploaded file object to disk and return the number of bytes written."""
+    with open(dest, "wb") as out:
+        shutil.copyfileobj(src, out, _COPY_CHUNK_SIZE)
+        return out.tell()
+
+def _save_job(job: DocumentJobResponse) -> None:
+    with SessionLocal() as db:
+        db.merge(IngestJob(**job.model_dump()))
+        db.commit()
+
+def _discard_upload(job: DocumentJobResponse, file_path: Path, start_time: float, error: str) -> None:
+    """Remove a document that could not be indexed and mark its job failed."""
+    if file_path.exists():
+        file_path.unlink()
+    _save_job(job.model_copy(update={
+        "status": "failed",
+        "processing_time": time.time() - start_time,
+        "error": error,
+    }))
+
+async def _ingest_document(job: DocumentJobResponse, file_path: Path, original_name: str, start_time: float) -> None:
+    """Extract and index an uploaded document, recording the outcome on its job."""
+    try:
+        loop = asyncio.get_running_loop()
+        raw_text = await loop.run_in_executor(EXTRACT_POOL, DocumentProcessor.load_document, file_path)
+        
+        if not raw_text.strip():
+            raise ValueError("Document appears to be empty or unreadable")
+        
+        # Build vector index
+        chunks_created = await run_in_threadpool(vector_store.build_index, raw_text, original_name, job.filename)
+        cached_stats.invalidate()
+        
+        await run_in_threadpool(_save_job, job.model_copy(update={
+            "status": "processed",
+            "chunks_created": chunks_created,
+            "processing_time": time.time() - start_time,
+        }))
+        
+        # Fire-and-forget orchestrator trigger (non-blocking)
+        try:
+            orchestrator.trigger_document_ingested(
+                filename=job.filename,
+                chunks_created=chunks_created,
+                file_size=job.file_size,
+                original_name=original_name,
+            )
+        except Exception:
+            # Do not fail upload on orchestrator errors
+            pass
+        
+    except asyncio.CancelledError:
+        # Shutdown interrupted the job; don't leave an unindexed file behind
+        logger.warning(f"Processing of {original_name} interrupted by shutdown")
+        _discard_upload(job, file_path, start_time, "Processing interrupted by server shutdown")
+        raise
+    except Exception as e:
+        logger.error(f"Error processing document {original_name}: {str(e)}")
+        await run_in_threadpool(_discard_upload, job, file_path, start_time, f"Error processing document: {str(e)}")
+
+async def stop_ingest_tasks(timeout: float = 30.0) -> None:
+    """Let in-flight ingest jobs finish, then cancel the rest (called on application shutdown)."""
+    if not _ingest_tasks:
+        return
+    _, pending = await asyncio.wait(set(_ingest_tasks), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+@router.post("/upload", response_model=DocumentJobResponse, status_code=202)
 async def upload_document(file: UploadFile = File(...)):
     """
-    Upload and process a medical document.
+    Upload a medical document and queue it for processing.
     Supported formats: PDF, DOCX, TXT, MD
+    Returns immediately with a job id; poll /jobs/{job_id} for the result.
     """
     start_time = time.time()
     
@@ -47,51 +141,23 @@ async def upload_document(file: UploadFile = File(...)):
         file_path = UPLOAD_DIR / unique_filename
         
         # Save uploaded file
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
+        file_size = await run_in_threadpool(_save_upload, file.file, file_path)
         
         logger.info(f"Saved uploaded file: {file.filename} as {unique_filename}")
         
-        # Process document
-        try:
-            raw_text = document_processor.load_document(file_path)
-            
-            if not raw_text.strip():
-                raise ValueError("Document appears to be empty or unreadable")
-            
-            # Build vector index
-            chunks_created = vector_store.build_index(raw_text, file.filename)
-            
-            processing_time = time.time() - start_time
-            
-            response = DocumentUploadResponse(
-                filename=unique_filename,
-                status="processed",
-                chunks_created=chunks_created,
-                file_size=len(content),
-                processing_time=processing_time
-            )
-
-            # Fire-and-forget orchestrator trigger (non-blocking)
-            try:
-                orchestrator.trigger_document_ingested(
-                    filename=unique_filename,
-                    chunks_created=chunks_created,
-                    file_size=len(content),
-                    original_name=file.filename,
-                )
-            except Exception:
-                # Do not fail upload on orchestrator errors
-                pass
-
-            return response
-            
-        except Exception as e:
-            # Clean up file on processing error
-            if file_path.exists():
-                file_path.unlink()
-            raise HTTPException(status_code=500, detail=f"Error processing document: {str(e)}")
+        # Extract and index in the background
+        job = DocumentJobResponse(
+            job_id=uuid.uuid4().hex,
+            filename=unique_filename,
+            status="processing",
+            file_size=file_size,
+        )
+        await run_in_threadpool(_save_job, job)
+        task = asyncio.create_task(_ingest_document(job, file_path, file.filename, start_time))
+        _ingest_tasks.add(task)
+        task.add_done_callback(_ingest_tasks.discard)
+        
+        return job
             
     except HTTPException:
         raise
@@ -99,6 +165,16 @@ async def upload_document(file: UploadFile = File(...)):
         logger.error(f"Unexpected error uploading document: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+@router.get("/jobs/{job_id}", response_model=DocumentJobResponse)
+def get_ingest_job(job_id: str, db: Session = Depends(get_db)):
+    """
+    Get the status of a document processing job.
+    """
+    row = db.get(IngestJob, job_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return DocumentJobResponse.model_validate(row, from_attributes=True)
+
 @router.get("/list")
 async def list_documents():
     """
@@ -107,16 +183,17 @@ async def list_documents():
     try:
         documents = []
         
-        # Get all files in upload directory
-        for file_path in UPLOAD_DIR.iterdir():
-            if file_path.is_file():
-                stat = file_path.stat()
-                documents.append({
-                    "filename": file_path.name,
-                    "file_size": stat.st_size,
-                    "upload_date": stat.st_mtime,
-                    "file_type": file_path.suffix.upper().lstrip('.')
-                })
+        # Get all files in upload directory (DirEntry caches its stat result)
+        with os.scandir(UPLOAD_DIR) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    documents.append({
+                        "filename": entry.name,
+                        "file_size": stat.st_size,
+                        "upload_date": stat.st_mtime,
+                        "file_type": os.path.splitext(entry.name)[1].upper().lstrip('.')
+                    })
         
         # Sort by upload date (newest first)
         documents.sort(key=lambda x: x["upload_date"], reverse=True)
@@ -138,9 +215,10 @@ async def delete_document(filename: str):
         if not file_path.exists():
             raise HTTPException(status_code=404, detail="Document not found")
         
-        # Remove from vector store
-        # Note: This requires knowing the original filename, which we'd need to store in metadata
-        # For now, we'll just delete the file
+        # Remove its chunks from the vector store (indexed under the stored filename as doc_id)
+        await run_in_threadpool(vector_store.delete_document, filename)
+        cached_stats.invalidate()
+        
         file_path.unlink()
         
         return {"message": f"Document {filename} deleted successfully"}
@@ -158,11 +236,16 @@ async def get_document_stats():
     """
     try:
         # Get vector store stats
-        vector_stats = vector_store.get_collection_stats()
+        vector_stats = cached_stats()
         
-        # Get file system stats
-        total_files = len(list(UPLOAD_DIR.iterdir()))
-        total_size = sum(f.stat().st_size for f in UPLOAD_DIR.iterdir() if f.is_file())
+        # Get file system stats in a single directory scan
+        total_files = 0
+        total_size = 0
+        with os.scandir(UPLOAD_DIR) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    total_files += 1
+                    total_size += entry.stat().st_size
         
         return {
             "total_files": total_files,
@@ -1,20 +1,23 @@
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from ..core.db import Base, engine, get_db
-from ..core.vector_store import VectorStore
+from ..core.db import get_db
+from ..core.embed_queue import EmbedQueue
+from ..core.vector_store import vector_store
 from ..models.tables import FAQ
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-Base.metadata.create_all(bind=engine)
-vector_store = VectorStore()
+# Coalesces FAQ re-embeddings from bursts of edits into batched calls
+index_queue = EmbedQueue(vector_store)
 
 
 class FAQIn(BaseModel):
@@ -30,45 +33,80 @@ class FAQOut(BaseModel):
     category: Optional[str] = None
 
 
-@router.get("/", response_model=List[FAQOut])
-def list_faqs(db: Session = Depends(get_db)):
-    rows = db.query(FAQ).order_by(FAQ.updated_at.desc()).all()
-    return [FAQOut(id=r.id, question=r.question, answer=r.answer, category=r.category) for r in rows]
+async def _index_faq(faq: FAQOut) -> None:
+    await index_queue.submit(
+        f"FAQ:{faq.id}",
+        f"Q: {faq.question}\nA: {faq.answer}",
+        metadata={"category": faq.category or "FAQ"},
+    )
 
 
-@router.post("/", response_model=FAQOut)
-def create_faq(payload: FAQIn, db: Session = Depends(get_db)):
+@router.get("/", response_model=List[FAQOut])
+def list_faqs(
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    # All FAQs by default (the staff page lists and edits them all); pass limit/offset to page.
+    # id breaks updated_at ties so pages neither repeat nor skip rows.
+    stmt = (
+        select(FAQ.id, FAQ.question, FAQ.answer, FAQ.category)
+        .order_by(FAQ.updated_at.desc(), FAQ.id.desc())
+        .offset(offset)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    # Plain column rows, no ORM identity map / instrumentation per FAQ
+    rows = db.execute(stmt).mappings().all()
+    return [FAQOut.model_validate(r) for r in rows]
+
+
+def _insert_faq(db: Session, payload: FAQIn) -> FAQOut:
     row = FAQ(question=payload.question, answer=payload.answer, category=payload.category)
     db.add(row)
     db.commit()
     db.refresh(row)
-
-    # Reindex as a document chunk with source = FAQ
-    try:
-        vector_store.build_index(f"Q: {row.question}\nA: {row.answer}", source=f"FAQ:{row.id}")
-    except Exception:
-        logger.warning("FAQ reindex failed", exc_info=True)
-
     return FAQOut(id=row.id, question=row.question, answer=row.answer, category=row.category)
 
 
-@router.put("/{faq_id}", response_model=FAQOut)
-def update_faq(faq_id: int, payload: FAQIn, db: Session = Depends(get_db)):
+def _update_faq_row(db: Session, faq_id: int, payload: FAQIn) -> Optional[FAQOut]:
     row = db.query(FAQ).filter(FAQ.id == faq_id).first()
     if not row:
-        raise HTTPException(status_code=404, detail="FAQ not found")
+        return None
     row.question = payload.question
     row.answer = payload.answer
     row.category = payload.category
     db.commit()
     db.refresh(row)
+    return FAQOut(id=row.id, question=row.question, answer=row.answer, category=row.category)
+
 
+@router.post("/", response_model=FAQOut)
+async def create_faq(payload: FAQIn, db: Session = Depends(get_db)):
+    # Blocking DB work runs in the threadpool; only the reindex is awaited on the event loop
+    faq = await run_in_threadpool(_insert_faq, db, payload)
+
+    # Index as a single record with source = FAQ
     try:
-        vector_store.build_index(f"Q: {row.question}\nA: {row.answer}", source=f"FAQ:{row.id}")
+        await _index_faq(faq)
     except Exception:
         logger.warning("FAQ reindex failed", exc_info=True)
 
-    return FAQOut(id=row.id, question=row.question, answer=row.answer, category=row.category)
+    return faq
+
+
+@router.put("/{faq_id}", response_model=FAQOut)
+async def update_faq(faq_id: int, payload: FAQIn, db: Session = Depends(get_db)):
+    faq = await run_in_threadpool(_update_faq_row, db, faq_id, payload)
+    if faq is None:
+        raise HTTPException(status_code=404, detail="FAQ not found")
+
+    try:
+        await _index_faq(faq)
+    except Exception:
+        logger.warning("FAQ reindex failed", exc_info=True)
+
+    return faq
 
 
 @router.delete("/{faq_id}")
@@ -78,6 +116,7 @@ def delete_faq(faq_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="FAQ not found")
     db.delete(row)
     db.commit()
+    vector_store.delete_documents_by_source(f"FAQ:{faq_id}")
     return {"message": "deleted"}
 
 
@@ -29,11 +29,10 @@ class LeaveRequestOut(BaseModel):
     start_date: Optional[str] = None
 
 
-from ..core.db import Base, engine, get_db
-from ..core.notifications import EmailNotifier
+from ..core.db import get_db
+from ..core.notifications import email_queue
 from ..models.tables import LeaveRequest as LeaveRequestTable
 
-Base.metadata.create_all(bind=engine)
 
 _default_allowed_days = 15
 
@@ -56,16 +55,15 @@ async def create_leave_request(req: LeaveRequestIn, db: Session = Depends(get_db
     db.refresh(row)
     logger.info("Leave request created for %s: %s days -> %s", req.email, req.days, status)
 
-    # Email notifications
-    notifier = EmailNotifier()
+    # Email notifications (queued; sent in the background)
     employee_subject = f"Leave request {row.id} {status}"
     employee_body = (
         f"Hello,\n\nYour leave request has been {status}.\n"
         f"Days: {row.days}\nStart date: {row.start_date or 'N/A'}\nReason: {row.reason or 'N/A'}\n\nRegards,\nBuddy"
     )
-    notifier.send_email(req.email, employee_subject, employee_body)
+    await email_queue.put(req.email, employee_subject, employee_body)
     # Notify manager (demo)
-    notifier.send_email("manager@linkdev.com", f"[Buddy] New leave request: {row.id}", employee_body)
+    await email_queue.put("manager@linkdev.com", f"[Buddy] New leave request: {row.id}", employee_body)
     return LeaveRequestOut(
         id=str(row.id),
         email=row.user_email,
@@ -83,7 +81,7 @@ async def get_latest_leave_request(email: str, db: Session = Depends(get_db)):
     row = (
         db.query(LeaveRequestTable)
         .filter(LeaveRequestTable.user_email == email)
-        .order_by(LeaveRequestTable.created_at.desc())
+        .order_by(LeaveRequestTable.created_at.desc(), LeaveRequestTable.id.desc())
         .first()
     )
     if not row:
@@ -0,0 +1,30 @@
+import time
+from typing import Callable, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class TTLMemo(Generic[T]):
+    """
+    Memoize a zero-argument callable for a fixed number of seconds.
+    Used to serve frequently polled metrics (e.g. vector store stats) without
+    hitting the backing store on every request.
+    """
+
+    def __init__(self, func: Callable[[], T], ttl: float = 5.0) -> None:
+        self.func = func
+        self.ttl = ttl
+        self._entry: Optional[Tuple[T, float]] = None  # (value, monotonic timestamp)
+
+    def __call__(self) -> T:
+        entry = self._entry
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+
+        value = self.func()
+        self._entry = (value, time.monotonic())
+        return value
+
+    def invalidate(self) -> None:
+        """Drop the cached value so the next call recomputes it."""
+        self._entry = None
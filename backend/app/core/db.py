@@ -1,6 +1,6 @@
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 DB_URL = os.getenv("DATABASE_URL", "sqlite:///./data/buddy.db")
@@ -10,11 +10,36 @@ class Base(DeclarativeBase):
     pass
 
 
-# SQLite needs check_same_thread=False for FastAPI
-engine = create_engine(DB_URL, connect_args={"check_same_thread": False} if DB_URL.startswith("sqlite") else {})
+_is_sqlite = DB_URL.startswith("sqlite")
+
+# SQLite needs check_same_thread=False for FastAPI; wait on locks instead of failing fast
+engine = create_engine(DB_URL, connect_args={"check_same_thread": False, "timeout": 30} if _is_sqlite else {})
+
+if _is_sqlite:
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers proceed alongside a single writer and avoids an fsync per commit
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-20000")
+        cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def init_db() -> None:
+    """Create missing tables and indexes (create_all skips indexes of existing tables)."""
+    Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
 def get_db():
     from typing import Generator
 
@@ -1,6 +1,5 @@
 from pathlib import Path
 from typing import Optional
-import markdown
 from docx import Document as DocxDocument
 from pypdf import PdfReader
 import logging
@@ -61,9 +60,8 @@ class DocumentProcessor:
     
     @staticmethod
     def _extract_from_md(file_path: Path) -> str:
-        """Extract text from Markdown file."""
-        md_content = file_path.read_text(encoding="utf-8", errors="ignore")
-        return markdown.markdown(md_content)
+        """Extract text from Markdown file (raw markdown is already plain text)."""
+        return file_path.read_text(encoding="utf-8", errors="ignore")
     
     @staticmethod
     def get_supported_extensions() -> list[str]:
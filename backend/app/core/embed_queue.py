@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class EmbedQueue:
+    """
+    Coalesce vector store upserts that arrive close together into one batched
+    embedding call. A batch is flushed once it holds batch_size items or
+    flush_ms after its first item, whichever comes first.
+    """
+
+    def __init__(self, vector_store: VectorStore, batch_size: int = 32, flush_ms: int = 50) -> None:
+        self.vector_store = vector_store
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self._queue: "asyncio.Queue[Tuple[str, str, dict, asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, source_id: str, text: str, metadata: Optional[dict] = None) -> None:
+        """Queue an upsert and wait until the batch containing it has been written."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((source_id, text, metadata or {}, future))
+        await future
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Last write wins when the same record is queued twice in one window
+            latest: Dict[str, Tuple[str, dict]] = {}
+            for source_id, text, metadata, _ in batch:
+                latest[source_id] = (text, metadata)
+
+            try:
+                await asyncio.to_thread(
+                    self.vector_store.upsert_many,
+                    list(latest),
+                    [text for text, _ in latest.values()],
+                    [metadata for _, metadata in latest.values()],
+                )
+            except Exception as exc:
+                logger.warning("Batched upsert of %d records failed: %s", len(latest), str(exc))
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_result(None)
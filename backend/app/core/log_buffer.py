@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from .db import SessionLocal
+from ..models.tables import QueryEvent
+
+logger = logging.getLogger(__name__)
+
+# Query events older than this are deleted; analytics report over the same window
+QUERY_EVENT_RETENTION = timedelta(hours=24)
+
+
+class QueryLogBuffer:
+    """
+    Buffer analytics query events in memory and persist them with a single
+    bulk insert every flush_interval seconds, or as soon as max_batch events
+    are pending. Each flush also deletes events older than `retention`.
+    Must be used from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = 500,
+        flush_interval: float = 5.0,
+        retention: timedelta = QUERY_EVENT_RETENTION,
+    ) -> None:
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.retention = retention
+        self._pending: List[Dict] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, event: Dict) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._pending.append(event)
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        batch, self._pending = self._pending, []
+        if batch:
+            await asyncio.to_thread(self._write, batch)
+
+    async def stop(self) -> None:
+        """Stop the periodic writer and persist anything still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _write(self, batch: List[Dict]) -> None:
+        try:
+            with SessionLocal() as db:
+                db.bulk_insert_mappings(QueryEvent, batch)
+                # Retention: drop events that fell out of the window (range delete on the ts index)
+                db.query(QueryEvent).filter(
+                    QueryEvent.ts < datetime.utcnow() - self.retention
+                ).delete(synchronize_session=False)
+                db.commit()
+        except Exception as exc:
+            logger.warning("Failed to persist %d query events: %s", len(batch), str(exc))
+
+
+query_log_buffer = QueryLogBuffer()
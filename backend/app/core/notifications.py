@@ -1,7 +1,9 @@
+import asyncio
 import logging
 import os
 import smtplib
 from email.message import EmailMessage
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -18,23 +20,78 @@ class EmailNotifier:
         return bool(self.host and self.port and self.sender)
 
     def send_email(self, to_email: str, subject: str, body: str) -> None:
+        self.send_batch([(to_email, subject, body)])
+
+    def send_batch(self, messages: List[Tuple[str, str, str]]) -> None:
+        """Send (to, subject, body) messages over a single SMTP session."""
         if not self._configured():
-            logger.info("[Email] %s -> %s | %s", subject, to_email, body.replace("\n", " ")[:200])
+            for to_email, subject, body in messages:
+                logger.info("[Email] %s -> %s | %s", subject, to_email, body.replace("\n", " ")[:200])
             return
         try:
-            msg = EmailMessage()
-            msg["Subject"] = subject
-            msg["From"] = self.sender
-            msg["To"] = to_email
-            msg.set_content(body)
-
             with smtplib.SMTP(self.host, self.port, timeout=10) as server:
                 if self.user and self.password:
                     server.starttls()
                     server.login(self.user, self.password)
-                server.send_message(msg)
-            logger.info("Email sent to %s: %s", to_email, subject)
+                for to_email, subject, body in messages:
+                    msg = EmailMessage()
+                    msg["Subject"] = subject
+                    msg["From"] = self.sender
+                    msg["To"] = to_email
+                    msg.set_content(body)
+                    try:
+                        server.send_message(msg)
+                        logger.info("Email sent to %s: %s", to_email, subject)
+                    except Exception as exc:
+                        logger.warning("Email send failed to %s: %s", to_email, str(exc))
         except Exception as exc:
-            logger.warning("Email send failed to %s: %s", to_email, str(exc))
+            logger.warning("Email send failed for %d message(s): %s", len(messages), str(exc))
+
+
+class EmailQueue:
+    """
+    Queue outgoing emails and send them from a background task, so request
+    handlers never wait on SMTP. Everything pending when the worker wakes up
+    goes out over one SMTP connection.
+    """
+
+    def __init__(self, notifier: Optional[EmailNotifier] = None) -> None:
+        self.notifier = notifier or EmailNotifier()
+        self._queue: "asyncio.Queue[Tuple[str, str, str]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the sender task on the running loop (no-op if already running)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush pending emails, then stop the sender task."""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Dropping %d unsent email(s) on shutdown", self._queue.qsize())
+        self._task.cancel()
+        self._task = None
+
+    async def put(self, to_email: str, subject: str, body: str) -> None:
+        self.start()
+        await self._queue.put((to_email, subject, body))
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self.notifier.send_batch, batch)
+            except Exception:
+                logger.warning("Email batch failed", exc_info=True)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
 
 
+email_queue = EmailQueue()
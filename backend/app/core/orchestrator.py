@@ -1,15 +1,85 @@
 import asyncio
-import json
+import concurrent.futures
+import functools
+import importlib.util
 import logging
 import os
+import secrets
+import threading
 import time
-import uuid
-from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from typing import Any, Coroutine, Dict, Optional, Tuple
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
+_token_hex = secrets.token_hex
+
+
+@dataclass(frozen=True, slots=True)
+class AirflowConfig:
+    base_url: Optional[str]
+    dag_id: Optional[str]
+    username: Optional[str]
+    password: Optional[str]
+    token: Optional[str]
+    verify_ssl: bool
+    enabled: bool
+
+
+@functools.lru_cache(maxsize=1)
+def _load_airflow_config() -> AirflowConfig:
+    """Read and parse the Airflow settings from the environment once per process."""
+    base_url = os.getenv("AIRFLOW_BASE_URL")
+    dag_id = os.getenv("AIRFLOW_DAG_ID")
+    return AirflowConfig(
+        base_url=base_url,
+        dag_id=dag_id,
+        username=os.getenv("AIRFLOW_USERNAME"),
+        password=os.getenv("AIRFLOW_PASSWORD"),
+        token=os.getenv("AIRFLOW_API_TOKEN"),
+        verify_ssl=os.getenv("AIRFLOW_VERIFY_SSL", "true").lower() == "true",
+        # Enable only when base URL and dag id are provided
+        enabled=os.getenv("AIRFLOW_ENABLED", "").lower() == "true" or bool(base_url and dag_id),
+    )
+
+
+class _BackgroundLoop:
+    """
+    Event loop running in a daemon thread. Coroutines can be submitted from
+    sync or async callers and run there without blocking the caller.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+            thread.start()
+            self.loop, self._thread = loop, thread
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> "concurrent.futures.Future[Any]":
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self) -> None:
+        with self._lock:
+            if self.loop is None:
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+            self.loop.close()
+            self.loop, self._thread = None, None
+
 
 class Orchestrator:
     """
@@ -25,50 +95,74 @@ class Orchestrator:
     """
 
     def __init__(self) -> None:
-        self.base_url: Optional[str] = os.getenv("AIRFLOW_BASE_URL")
-        self.dag_id: Optional[str] = os.getenv("AIRFLOW_DAG_ID")
-        self.username: Optional[str] = os.getenv("AIRFLOW_USERNAME")
-        self.password: Optional[str] = os.getenv("AIRFLOW_PASSWORD")
-        self.token: Optional[str] = os.getenv("AIRFLOW_API_TOKEN")
-        self.verify_ssl: bool = os.getenv("AIRFLOW_VERIFY_SSL", "true").lower() == "true"
-
-        # Enable only when base URL and dag id are provided
-        self.enabled: bool = (
-            os.getenv("AIRFLOW_ENABLED", "").lower() == "true"
-            or (self.base_url and self.dag_id)
-        )
-
-        if not self.enabled:
+        self._cfg = _load_airflow_config()
+
+        # Auth/headers are fixed per process; the HTTP client is created on first use
+        # and reused so DAG triggers share pooled keep-alive connections.
+        self._headers: Dict[str, str] = {}
+        self._auth: Optional[Tuple[str, str]] = None
+        if self._cfg.token:
+            self._headers["Authorization"] = f"Bearer {self._cfg.token}"
+        elif self._cfg.username and self._cfg.password:
+            self._auth = (self._cfg.username, self._cfg.password)
+        self._client: Optional[httpx.AsyncClient] = None
+        # Triggers (and the client above) live on a dedicated background loop
+        self._bg = _BackgroundLoop("orchestrator-loop")
+
+        if not self._cfg.enabled:
             logger.info("Orchestrator disabled (missing AIRFLOW_BASE_URL/AIRFLOW_DAG_ID or AIRFLOW_ENABLED)")
         else:
             logger.info("Orchestrator enabled: Airflow integration will be used for document events")
 
+    async def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                # HTTP/2 when h2 is installed (httpx[http2]); otherwise HTTP/1.1
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=httpx.Timeout(10.0, connect=2.0),
+                verify=self._cfg.verify_ssl,
+                auth=self._auth,
+                headers=self._headers,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            )
+        return self._client
+
+    async def _close_client(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client and stop the background loop (called on application shutdown)."""
+        if self._bg.loop is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.wrap_future(self._bg.submit(self._close_client())), 5)
+        except Exception as exc:
+            logger.warning("Failed to close Airflow client: %s", str(exc))
+        self._bg.stop()
+
     async def _trigger_airflow_dag(self, dag_id: str, conf: Dict[str, Any]) -> None:
-        if not self.base_url:
+        if not self._cfg.base_url:
             logger.warning("Airflow base URL not configured; skipping DAG trigger")
             return
 
-        url = f"{self.base_url.rstrip('/')}/api/v1/dags/{dag_id}/dagRuns"
-        dag_run_id = f"doc_ingested_{int(time.time())}_{uuid.uuid4().hex[:8]}"
-
-        headers: Dict[str, str] = {"Content-Type": "application/json"}
-        auth = None
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
-        elif self.username and self.password:
-            auth = (self.username, self.password)
+        url = f"{self._cfg.base_url.rstrip('/')}/api/v1/dags/{dag_id}/dagRuns"
+        dag_run_id = f"doc_ingested_{int(time.time())}_{_token_hex(4)}"
 
         payload = {"conf": conf, "dag_run_id": dag_run_id}
 
         try:
-            async with httpx.AsyncClient(timeout=10.0, verify=self.verify_ssl, auth=auth, headers=headers) as client:
-                resp = await client.post(url, data=json.dumps(payload))
-                if resp.status_code >= 300:
-                    logger.warning(
-                        "Airflow DAG trigger failed (%s): %s", resp.status_code, resp.text[:200]
-                    )
-                else:
-                    logger.info("Airflow DAG triggered: %s (%s)", dag_id, dag_run_id)
+            client = await self._get_client()
+            resp = await client.post(
+                url, content=orjson.dumps(payload), headers={"Content-Type": "application/json"}
+            )
+            if resp.status_code >= 300:
+                logger.warning(
+                    "Airflow DAG trigger failed (%s): %s", resp.status_code, resp.text[:200]
+                )
+            else:
+                logger.info("Airflow DAG triggered: %s (%s, %s)", dag_id, dag_run_id, resp.http_version)
         except Exception as exc:
             logger.warning("Airflow trigger error: %s", str(exc))
 
@@ -76,7 +170,7 @@ class Orchestrator:
         """
         Fire-and-forget trigger to Airflow DAG for post-processing a newly indexed document.
         """
-        if not self.enabled or not self.dag_id:
+        if not self._cfg.enabled or not self._cfg.dag_id:
             return
 
         conf = {
@@ -88,13 +182,7 @@ class Orchestrator:
             "timestamp": int(time.time()),
         }
 
-        try:
-            asyncio.create_task(self._trigger_airflow_dag(self.dag_id, conf))
-        except RuntimeError:
-            # No running loop (e.g., during sync contexts) -> run in a new loop/thread
-            try:
-                asyncio.run(self._trigger_airflow_dag(self.dag_id, conf))
-            except Exception as exc:
-                logger.warning("Failed to dispatch Airflow trigger: %s", str(exc))
+        self._bg.submit(self._trigger_airflow_dag(self._cfg.dag_id, conf))
 
 
+orchestrator = Orchestrator()
@@ -1,16 +1,33 @@
+import importlib.util
 import logging
 import os
-from typing import List
+from typing import AsyncIterator, List, Optional
 
 from dotenv import load_dotenv
 from langchain.schema import Document
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# System prompt for Buddy (HR/IT) domain; shared by every request
+_SYSTEM_MSG = {
+    "role": "system",
+    "content": (
+        "You are Buddy, an HR/IT employee support assistant. "
+        "Answer the user's question strictly based on the provided company documents and context (policies, benefits, IT procedures, handbooks). "
+        "If the information is not available in the context, clearly state that you don't have enough information and suggest uploading the relevant policy or contacting HR/IT. "
+        "Keep answers concise, actionable, and aligned with company policy. "
+        "Do not provide medical or clinical guidance. "
+    ),
+}
+
+# "Document N: " labels for the usual top-k range
+_DOC_PREFIXES = tuple(f"Document {i}: " for i in range(1, 11))
+
 class QAEngine:
     """
     Question-Answering engine using OpenAI GPT models.
@@ -20,14 +37,78 @@ class QAEngine:
         self.model = model
         self.api_key = os.getenv("OPENAI_API_KEY")
         
+        # One pooled HTTP client per engine, shared by all requests; closed on shutdown
+        self._http: Optional[httpx.AsyncClient] = None
+        
         if not self.api_key:
             logger.warning("OPENAI_API_KEY not found in environment variables")
             self.client = None
         else:
-            self.client = OpenAI(api_key=self.api_key)
+            self._http = httpx.AsyncClient(
+                # Multiplex concurrent completions over one connection when h2 is installed
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=200),
+                timeout=httpx.Timeout(60.0, connect=2.0),
+                event_hooks={"response": [self._log_http_version]},
+            )
+            self.client = AsyncOpenAI(api_key=self.api_key, http_client=self._http)
             logger.info(f"QA Engine initialized with model: {model}")
+        
+        # Configuration is fixed after init, so the model info is built once
+        self._model_info = {
+            "model": self.model,
+            "api_configured": self.client is not None,
+            "api_key_set": bool(self.api_key)
+        }
+    
+    def _build_messages(self, question: str, contexts: List[Document]) -> List[dict]:
+        """Build the chat messages (system prompt + question with document context)."""
+        # Create context string
+        context_str = "\n\n".join(
+            (_DOC_PREFIXES[i] if i < len(_DOC_PREFIXES) else f"Document {i+1}: ") + doc.page_content
+            for i, doc in enumerate(contexts)
+        )
+        
+        # Create user message
+        user_message = f"""
+Question: {question}
+
+Context from company documents:
+{context_str}
+
+Please provide a comprehensive answer based on the available information.
+"""
+        
+        return [_SYSTEM_MSG, {"role": "user", "content": user_message}]
+    
+    async def answer_question_stream(self, question: str, contexts: List[Document], usage: Optional[dict] = None) -> AsyncIterator[str]:
+        """
+        Generate an answer to the question, yielding text fragments as the model produces them.
+        If a `usage` dict is given, it is filled with the token usage reported at the end of the stream.
+        """
+        if not self.client:
+            raise RuntimeError("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
+        
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=self._build_messages(question, contexts),
+            temperature=0.1,  # Low temperature for more consistent medical responses
+            max_tokens=500,
+            top_p=0.9,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        
+        async for chunk in stream:
+            if chunk.choices:
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+            # The final chunk carries no choices, only the usage totals
+            if chunk.usage is not None and usage is not None:
+                usage["total_tokens"] = chunk.usage.total_tokens
     
-    def answer_question(self, question: str, contexts: List[Document]) -> dict:
+    async def answer_question(self, question: str, contexts: List[Document]) -> dict:
         """
         Generate an answer to the question using the provided contexts.
         Returns a dictionary with answer, sources, and metadata.
@@ -40,57 +121,21 @@ class QAEngine:
             }
         
         try:
-            # Extract text content from documents
-            context_texts = [doc.page_content for doc in contexts]
-            sources = [doc.metadata.get("source", "Unknown") for doc in contexts]
-            
-            # Create context string
-            context_str = "\n\n".join([f"Document {i+1}: {text}" for i, text in enumerate(context_texts)])
-            
-            # Create system prompt for Buddy (HR/IT) domain
-            system_prompt = (
-                "You are Buddy, an HR/IT employee support assistant. "
-                "Answer the user's question strictly based on the provided company documents and context (policies, benefits, IT procedures, handbooks). "
-                "If the information is not available in the context, clearly state that you don't have enough information and suggest uploading the relevant policy or contacting HR/IT. "
-                "Keep answers concise, actionable, and aligned with company policy. "
-                "Do not provide medical or clinical guidance. "
-            )
-            
-            # Create user message
-            user_message = f"""
-Question: {question}
-
-Context from company documents:
-{context_str}
-
-Please provide a comprehensive answer based on the available information.
-"""
-            
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ]
-            
-            # Generate response
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.1,  # Low temperature for more consistent medical responses
-                max_tokens=500,
-                top_p=0.9
-            )
-            
-            answer = response.choices[0].message.content.strip()
+            # Collect the streamed answer for callers that need the full response
+            usage: dict = {}
+            answer = "".join([
+                fragment async for fragment in self.answer_question_stream(question, contexts, usage)
+            ]).strip()
             
-            # Get unique sources
-            unique_sources = list(set(sources))
+            # Get unique sources, in retrieval order
+            unique_sources = list(dict.fromkeys(doc.metadata.get("source", "Unknown") for doc in contexts))
             
             return {
                 "answer": answer,
                 "sources": unique_sources,
                 "context_count": len(contexts),
                 "model_used": self.model,
-                "tokens_used": response.usage.total_tokens if response.usage else None
+                "tokens_used": usage.get("total_tokens")
             }
             
         except Exception as e:
@@ -107,8 +152,14 @@ Please provide a comprehensive answer based on the available information.
     
     def get_model_info(self) -> dict:
         """Get information about the current model configuration."""
-        return {
-            "model": self.model,
-            "api_configured": self.client is not None,
-            "api_key_set": bool(self.api_key)
-        }
\ No newline at end of file
+        return dict(self._model_info)
+    
+    async def _log_http_version(self, response: httpx.Response) -> None:
+        # Report the negotiated protocol once, then drop the hook
+        logger.info(f"OpenAI API connection uses {response.http_version}")
+        self._http.event_hooks["response"].remove(self._log_http_version)
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (called on application shutdown)."""
+        if self._http is not None:
+            await self._http.aclose()
\ No newline at end of file
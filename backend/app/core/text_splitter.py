@@ -0,0 +1,61 @@
+import re
+from bisect import bisect_left, bisect_right
+from typing import List
+
+# Chunk break points (just after the separator), strongest first:
+# paragraph break, line break, sentence end, any whitespace
+_SPLIT_PATTERNS = tuple(re.compile(p) for p in (r"\n\n", r"\n", r"\. ", r"\s"))
+
+
+def _split_text(text: str, chunk_size: int = 500, overlap: int = 100) -> List[str]:
+    """
+    Split text into chunks of at most chunk_size characters, cutting at the strongest
+    separator that fits and starting each chunk up to `overlap` characters before the
+    previous one ended. Break points are found with one regex scan per separator.
+    """
+    n = len(text)
+    boundaries = [[m.end() for m in pattern.finditer(text)] for pattern in _SPLIT_PATTERNS]
+    word_starts = boundaries[-1]
+    
+    chunks = []
+    start = end = 0
+    while start < n:
+        limit = start + chunk_size
+        if limit >= n:
+            end = n
+        else:
+            # Cut past the previous chunk's end so every chunk adds new text;
+            # with no separator in that range, hard cut at the limit
+            prev_end, end = end, limit
+            for positions in boundaries:
+                i = bisect_right(positions, limit) - 1
+                if i >= 0 and positions[i] > prev_end:
+                    end = positions[i]
+                    break
+        
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= n:
+            break
+        
+        # Carry the last `overlap` characters over, starting at a word boundary
+        i = bisect_left(word_starts, end - overlap)
+        next_start = word_starts[i] if i < len(word_starts) else end
+        start = next_start if start < next_start < end else end
+    
+    return chunks
+
+
+class RegexTextSplitter:
+    """
+    Text splitter with the same split_text interface as LangChain's
+    RecursiveCharacterTextSplitter, in a single linear pass (see _split_text).
+    """
+    
+    def __init__(self, chunk_size: int = 500, chunk_overlap: int = 100):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+    
+    def split_text(self, text: str) -> List[str]:
+        return _split_text(text, self.chunk_size, self.chunk_overlap)
@@ -1,14 +1,33 @@
+import functools
 import logging
+import threading
+import uuid
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from langchain.schema import Document
 from langchain_chroma import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from .cache import TTLMemo
+from .text_splitter import RegexTextSplitter
 
 logger = logging.getLogger(__name__)
 
+
+def _embedding_settings() -> Tuple[dict, dict]:
+    """
+    (model_kwargs, encode_kwargs) for the embedding model: half precision and large
+    batches on GPU, default fp32 and smaller batches (bounded memory) on CPU.
+    """
+    # Imported on first model load so importing this module doesn't load torch or initialise CUDA
+    import torch
+    
+    if torch.cuda.is_available():
+        return {"device": "cuda", "model_kwargs": {"torch_dtype": torch.float16}}, {"batch_size": 128}
+    return {"device": "cpu"}, {"batch_size": 32}
+
+
 class VectorStore:
     """
     Manages document indexing and retrieval using ChromaDB and HuggingFace embeddings.
@@ -17,22 +36,56 @@ class VectorStore:
     def __init__(self, persist_dir: str = "data/chroma_db", embed_model: str = "intfloat/multilingual-e5-base"):
         self.persist_dir = str(Path(persist_dir).absolute())
         self.embed_model = embed_model
-        self.embeddings = HuggingFaceEmbeddings(model_name=embed_model)
+        # Embedding model, loaded on first use (see the `embeddings` property)
+        self._embeddings: Optional[HuggingFaceEmbeddings] = None
+        self._embeddings_lock = threading.Lock()
         self.collection_name = "medrag_collection"
         
         # Ensure persist directory exists
         Path(self.persist_dir).mkdir(parents=True, exist_ok=True)
         
+        # Chroma handle, opened on first use and kept for the life of the process
+        self._vs: Optional[Chroma] = None
+        self._vs_lock = threading.Lock()
+        
+        # Repeated questions (e.g. common FAQs) skip the embedding model entirely
+        self._embed_query = functools.lru_cache(maxsize=1024)(self._embed_query_uncached)
+        
         # Initialize text splitter
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=500,
-            chunk_overlap=100,
-            separators=["\n\n", "\n", ". ", " "]
-        )
+        self.text_splitter = RegexTextSplitter(chunk_size=500, chunk_overlap=100)
+    
+    @property
+    def embeddings(self) -> HuggingFaceEmbeddings:
+        """Embedding model, loaded on first access so startup and idle workers don't pay for it."""
+        if self._embeddings is None:
+            with self._embeddings_lock:
+                if self._embeddings is None:
+                    model_kwargs, encode_kwargs = _embedding_settings()
+                    self._embeddings = HuggingFaceEmbeddings(
+                        model_name=self.embed_model,
+                        model_kwargs=model_kwargs,
+                        encode_kwargs=encode_kwargs,
+                    )
+        return self._embeddings
+    
+    def _get_vs(self) -> Chroma:
+        if self._vs is None:
+            with self._vs_lock:
+                if self._vs is None:
+                    # No embedding function: writes and queries pass precomputed vectors, so
+                    # stats/deletes never load the embedding model
+                    self._vs = Chroma(
+                        collection_name=self.collection_name,
+                        persist_directory=self.persist_dir,
+                    )
+        return self._vs
     
-    def build_index(self, raw_text: str, source: str) -> int:
+    def build_index(self, raw_text: str, source: str, doc_id: Optional[str] = None) -> int:
         """
         Split text into chunks, embed, and store in ChromaDB.
+        `source` is the display name cited in answers; `doc_id` identifies this upload
+        (e.g. the unique stored filename) and defaults to a fresh id. Re-indexing the
+        same doc_id replaces its chunks; different uploads never share ids.
         Returns the number of chunks created.
         """
         try:
@@ -40,45 +93,85 @@ class VectorStore:
             chunks = self.text_splitter.split_text(raw_text)
             logger.info(f"Split document {source} into {len(chunks)} chunks")
             
-            # Create documents with metadata
-            docs = [
-                Document(
-                    page_content=f"passage: {chunk}", 
-                    metadata={"source": source, "chunk_id": i}
-                )
-                for i, chunk in enumerate(chunks)
-            ]
+            doc_id = doc_id or uuid.uuid4().hex
+            n = len(chunks)
+            ids = [f"{doc_id}:{i}" for i in range(n)]
+            texts = [f"passage: {chunk}" for chunk in chunks]
+            metadatas = [{"source": source, "doc_id": doc_id, "chunk_id": i} for i in range(n)]
             
-            # Get or create vector store
-            vector_store = Chroma(
-                collection_name=self.collection_name,
-                embedding_function=self.embeddings,
-                persist_directory=self.persist_dir,
-            )
+            # Embed all chunks as one batch first, so a failure leaves the old chunks intact
+            embeddings = self.embeddings.embed_documents(texts)
             
-            # Add documents to vector store
-            vector_store.add_documents(docs)
-            logger.info(f"Successfully indexed {len(docs)} chunks from {source}")
+            collection = self._get_vs()._collection
+            
+            # Drop chunks from an earlier indexing of this upload (it may have had more of them)
+            collection.delete(where={"doc_id": doc_id})
+            
+            # Write the parallel lists straight to Chroma
+            collection.upsert(
+                ids=ids,
+                embeddings=embeddings,
+                documents=texts,
+                metadatas=metadatas,
+            )
+            logger.info(f"Successfully indexed {len(texts)} chunks from {source}")
             
-            return len(docs)
+            return len(texts)
             
         except Exception as e:
             logger.error(f"Error building index for {source}: {str(e)}")
             raise
     
+    def upsert(self, source_id: str, text: str, metadata: Optional[dict] = None) -> None:
+        """
+        Insert or replace a single record keyed by source_id (e.g. "FAQ:12").
+        Only this record is embedded; the rest of the collection is untouched.
+        """
+        self.upsert_many([source_id], [text], [metadata or {}])
+    
+    def upsert_many(self, source_ids: List[str], texts: List[str], metadatas: List[dict]) -> None:
+        """
+        Insert or replace several records keyed by source_id, embedding all texts in one batch.
+        """
+        try:
+            documents = [f"passage: {text}" for text in texts]
+            
+            self._get_vs()._collection.upsert(
+                ids=source_ids,
+                embeddings=self.embeddings.embed_documents(documents),
+                documents=documents,
+                metadatas=[
+                    {**metadata, "source": source_id, "chunk_id": 0}
+                    for source_id, metadata in zip(source_ids, metadatas)
+                ],
+            )
+            logger.info(f"Upserted {len(source_ids)} records into vector store")
+            
+        except Exception as e:
+            logger.error(f"Error upserting {source_ids}: {str(e)}")
+            raise
+    
+    def _embed_query_uncached(self, query: str) -> Tuple[float, ...]:
+        # Search with query prefix for better retrieval
+        return tuple(self.embeddings.embed_query(f"query: {query}"))
+    
     def retrieve(self, query: str, top_k: int = 5) -> List[Document]:
         """
         Retrieve top-k most relevant chunks from ChromaDB.
         """
         try:
-            vector_store = Chroma(
-                collection_name=self.collection_name,
-                embedding_function=self.embeddings,
-                persist_directory=self.persist_dir,
-            )
+            collection = self._get_vs()._collection
             
-            # Search with query prefix for better retrieval
-            docs = vector_store.similarity_search(f"query: {query}", k=top_k)
+            # Query Chroma directly with the (cached) embedding of the prefixed query
+            result = collection.query(
+                query_embeddings=[list(self._embed_query(query))],
+                n_results=top_k,
+                include=["documents", "metadatas"],
+            )
+            docs = [
+                Document(page_content=text, metadata=metadata or {})
+                for text, metadata in zip(result["documents"][0], result["metadatas"][0])
+            ]
             logger.info(f"Retrieved {len(docs)} documents for query: {query[:50]}...")
             
             return docs
@@ -90,11 +183,7 @@ class VectorStore:
     def get_collection_stats(self) -> dict:
         """Get statistics about the vector store collection."""
         try:
-            vector_store = Chroma(
-                collection_name=self.collection_name,
-                embedding_function=self.embeddings,
-                persist_directory=self.persist_dir,
-            )
+            vector_store = self._get_vs()
             
             # Get collection info
             collection = vector_store._collection
@@ -115,14 +204,19 @@ class VectorStore:
                 "error": str(e)
             }
     
+    def delete_document(self, doc_id: str) -> None:
+        """Delete all chunks indexed for one upload (the `doc_id` given to build_index)."""
+        try:
+            self._get_vs()._collection.delete(where={"doc_id": doc_id})
+            logger.info(f"Deleted chunks for document: {doc_id}")
+        except Exception as e:
+            logger.error(f"Error deleting chunks for document {doc_id}: {str(e)}")
+            raise
+    
     def delete_documents_by_source(self, source: str) -> bool:
         """Delete all documents from a specific source."""
         try:
-            vector_store = Chroma(
-                collection_name=self.collection_name,
-                embedding_function=self.embeddings,
-                persist_directory=self.persist_dir,
-            )
+            vector_store = self._get_vs()
             
             # Get documents with the specified source
             docs = vector_store.get(where={"source": source})
@@ -136,4 +230,10 @@ class VectorStore:
             
         except Exception as e:
             logger.error(f"Error deleting documents from source {source}: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+
+# Shared by all routers: one Chroma handle and at most one embedding model per process
+vector_store = VectorStore()
+# Collection stats are polled by dashboards; serve them from a short-lived cache
+cached_stats = TTLMemo(vector_store.get_collection_stats, ttl=5.0)
@@ -1,17 +1,70 @@
 import os
+from contextlib import asynccontextmanager
+from importlib import import_module
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
-from .api import analytics, auth, chat, documents, faqs, transactions
+from .core.db import init_db
+from .core.log_buffer import query_log_buffer
+from .core.notifications import email_queue
+from .core.orchestrator import orchestrator
+
+
+# API routers as (module under app.api, URL prefix). They pull in LangChain, Chroma,
+# OpenAI etc., so they are imported at startup rather than when this module loads.
+API_ROUTERS = (
+    ("documents", "/api/documents"),
+    ("chat", "/api/chat"),
+    ("analytics", "/api/analytics"),
+    ("transactions", "/api/transactions"),
+    ("auth", "/api/auth"),
+    ("faqs", "/api/faqs"),
+)
+
+
+def include_api_routers(app: FastAPI) -> dict:
+    """Import and register the API routers once per app; returns the router modules by name."""
+    if getattr(app.state, "api_modules", None) is None:
+        modules = {}
+        for name, prefix in API_ROUTERS:
+            module = import_module(f".api.{name}", __package__)
+            app.include_router(module.router, prefix=prefix, tags=[name])
+            modules[name] = module
+        app.state.api_modules = modules
+    return app.state.api_modules
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: register routers, create tables/indexes once per process
+    api = include_api_routers(app)
+    init_db()
+    email_queue.start()
+    yield
+    # Shutdown: finish or cancel uploads in progress, flush queued work, close pooled clients
+    # and release worker processes
+    await api["documents"].stop_ingest_tasks()
+    await email_queue.stop()
+    await api["faqs"].index_queue.stop()
+    await query_log_buffer.stop()
+    await orchestrator.aclose()
+    await api["chat"].qa_engine.aclose()
+    await api["analytics"].qa_engine.aclose()
+    api["documents"].EXTRACT_POOL.shutdown(wait=False, cancel_futures=True)
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Buddy API",
     description="Buddy chatbot backend with document processing and AI chat",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # Serialize responses with orjson (C encoder, native datetime support)
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS for React frontend
@@ -27,13 +80,28 @@ default_origins = [
 env_origins = os.getenv("CORS_ORIGINS")
 allow_origin_regex = os.getenv("CORS_ORIGIN_REGEX") or r"https?://(localhost|127\.0\.0\.1)(:\d+)?$"
 
+# Probe endpoints called by infrastructure, not browsers; they skip CORS handling
+CORS_EXEMPT_PATHS = frozenset({"/", "/health"})
+
+
+class APICORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that passes requests for CORS_EXEMPT_PATHS straight through."""
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"] in CORS_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Starlette compiles allow_origin_regex once; methods/headers are limited to what the frontend sends
 app.add_middleware(
-    CORSMiddleware,
+    APICORSMiddleware,
     allow_origins=[o.strip() for o in env_origins.split(",") if o.strip()] if env_origins else default_origins,
     allow_origin_regex=allow_origin_regex,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["authorization", "content-type"],
 )
 
 # Create upload directory if it doesn't exist
@@ -43,13 +111,7 @@ upload_dir.mkdir(exist_ok=True)
 # Mount static files for uploaded documents
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
-# Include API routers
-app.include_router(documents.router, prefix="/api/documents", tags=["documents"])
-app.include_router(chat.router, prefix="/api/chat", tags=["chat"])
-app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
-app.include_router(transactions.router, prefix="/api/transactions", tags=["transactions"])
-app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
-app.include_router(faqs.router, prefix="/api/faqs", tags=["faqs"])
+# API routers are included on startup (see lifespan)
 
 @app.get("/")
 async def root():
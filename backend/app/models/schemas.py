@@ -1,12 +1,19 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 from datetime import datetime
 
-class ChatRequest(BaseModel):
+
+class _Schema(BaseModel):
+    # API payloads are built once and never mutated; use model_copy(update=...) to derive new ones.
+    # protected_namespaces=() allows fields such as ChatResponse.model_used without a warning.
+    model_config = ConfigDict(frozen=True, protected_namespaces=())
+
+
+class ChatRequest(_Schema):
     query: str
     max_results: Optional[int] = 5
 
-class ChatResponse(BaseModel):
+class ChatResponse(_Schema):
     answer: str
     sources: List[str]
     context_count: int
@@ -14,7 +21,7 @@ class ChatResponse(BaseModel):
     tokens_used: Optional[int] = None
     error: Optional[str] = None
 
-class DocumentUploadResponse(BaseModel):
+class DocumentUploadResponse(_Schema):
     filename: str
     status: str
     chunks_created: int
@@ -22,7 +29,16 @@ class DocumentUploadResponse(BaseModel):
     processing_time: float
     error: Optional[str] = None
 
-class DocumentInfo(BaseModel):
+class DocumentJobResponse(_Schema):
+    job_id: str
+    filename: str
+    status: str  # processing | processed | failed
+    file_size: int
+    chunks_created: Optional[int] = None
+    processing_time: Optional[float] = None
+    error: Optional[str] = None
+
+class DocumentInfo(_Schema):
     id: int
     filename: str
     original_name: str
@@ -33,7 +49,7 @@ class DocumentInfo(BaseModel):
     upload_date: datetime
     processing_time: Optional[float] = None
 
-class AnalyticsResponse(BaseModel):
+class AnalyticsResponse(_Schema):
     total_documents: int
     total_queries: int
     avg_response_time: float
@@ -41,7 +57,7 @@ class AnalyticsResponse(BaseModel):
     popular_queries: List[dict]
     document_stats: dict
 
-class HealthResponse(BaseModel):
+class HealthResponse(_Schema):
     status: str
     service: str
     vector_store_status: dict
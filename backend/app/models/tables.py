@@ -1,10 +1,33 @@
+import logging
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Enum, Float, ForeignKey, Index, Integer, String, Text, event
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.expression import FunctionElement
 
 from ..core.db import Base
 
+logger = logging.getLogger(__name__)
+
+
+class utcnow(FunctionElement):
+    """Database-side current UTC timestamp, with sub-second precision on SQLite."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP only has one-second resolution on SQLite, which ties
+    # rows created in the same second in "latest first" listings
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
 
 class User(Base):
     __tablename__ = "users"
@@ -13,7 +36,7 @@ class User(Base):
     email = Column(String(255), unique=True, index=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     role = Column(String(50), nullable=False, default="employee")  # employee | manager | staff
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=utcnow())
 
 
 class LeaveRequest(Base):
@@ -25,8 +48,8 @@ class LeaveRequest(Base):
     reason = Column(Text, nullable=True)
     start_date = Column(String(20), nullable=True)  # ISO date string for simplicity
     status = Column(String(20), nullable=False, default="pending")  # pending | approved | rejected
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=utcnow())
+    updated_at = Column(DateTime(timezone=True), server_default=utcnow(), onupdate=utcnow())
 
 
 class FAQ(Base):
@@ -36,6 +59,98 @@ class FAQ(Base):
     question = Column(Text, nullable=False)
     answer = Column(Text, nullable=False)
     category = Column(String(100), nullable=True)
-    updated_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime(timezone=True), server_default=utcnow(), onupdate=utcnow())
+
+
+class QueryEvent(Base):
+    __tablename__ = "query_events"
+
+    id = Column(Integer, primary_key=True)
+    ts = Column(DateTime, index=True, nullable=False, default=datetime.utcnow)
+    query = Column(Text, nullable=False, default="")
+    response_time = Column(Float, nullable=False, default=0)
+    success = Column(Boolean, nullable=False, default=False)
+    tokens_used = Column(Integer, nullable=False, default=0)
+    sources_count = Column(Integer, nullable=False, default=0)
+
+
+class IngestJob(Base):
+    # Document processing jobs; kept in the database so every worker can report them
+    __tablename__ = "ingest_jobs"
+
+    job_id = Column(String(32), primary_key=True)
+    filename = Column(String(255), nullable=False)
+    status = Column(String(20), nullable=False)  # processing | processed | failed
+    file_size = Column(Integer, nullable=False)
+    chunks_created = Column(Integer, nullable=True)
+    processing_time = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=utcnow())
+
+
+# Serve "latest first" listings straight from an index
+Index("ix_faq_updated_at", FAQ.updated_at.desc())
+Index("ix_leave_user_created", LeaveRequest.user_email, LeaveRequest.created_at.desc())
+# Common filter predicates
+Index("ix_leave_status_created", LeaveRequest.status, LeaveRequest.created_at)
+Index("ix_faq_category", FAQ.category)
+
+
+# SQLite FTS5 index over FAQ question/answer, kept in sync with triggers
+FAQ_FTS_TABLE = "faq_fts"
+_faq_fts_ddl = [
+    f"CREATE VIRTUAL TABLE {FAQ_FTS_TABLE} USING fts5(question, answer, content='faqs', content_rowid='id')",
+    f"""CREATE TRIGGER faqs_fts_ai AFTER INSERT ON faqs BEGIN
+        INSERT INTO {FAQ_FTS_TABLE}(rowid, question, answer) VALUES (new.id, new.question, new.answer);
+    END""",
+    f"""CREATE TRIGGER faqs_fts_ad AFTER DELETE ON faqs BEGIN
+        INSERT INTO {FAQ_FTS_TABLE}({FAQ_FTS_TABLE}, rowid, question, answer)
+        VALUES ('delete', old.id, old.question, old.answer);
+    END""",
+    f"""CREATE TRIGGER faqs_fts_au AFTER UPDATE OF question, answer ON faqs BEGIN
+        INSERT INTO {FAQ_FTS_TABLE}({FAQ_FTS_TABLE}, rowid, question, answer)
+        VALUES ('delete', old.id, old.question, old.answer);
+        INSERT INTO {FAQ_FTS_TABLE}(rowid, question, answer) VALUES (new.id, new.question, new.answer);
+    END""",
+    # Index FAQs that existed before the FTS table was created
+    f"INSERT INTO {FAQ_FTS_TABLE}({FAQ_FTS_TABLE}) VALUES ('rebuild')",
+]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_faq_fts(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FAQ_FTS_TABLE,)
+    ).first()
+    if exists:
+        return
+    try:
+        for statement in _faq_fts_ddl:
+            connection.exec_driver_sql(statement)
+    except Exception:
+        logger.warning("FAQ full-text index unavailable; falling back to LIKE search", exc_info=True)
 
 
+@event.listens_for(Base.metadata, "after_create")
+def _fill_legacy_timestamp_defaults(target, connection, **kw):
+    # SQLite tables created before the timestamp columns had a server default have no
+    # DEFAULT clause (and SQLite can't add one in place); fill those columns on insert.
+    # This costs an extra UPDATE per insert on such databases until they are recreated.
+    if connection.dialect.name != "sqlite":
+        return
+    for table in target.sorted_tables:
+        columns = [c.name for c in table.columns if c.server_default is not None]
+        if not columns:
+            continue
+        defaults = {row[1]: row[4] for row in connection.exec_driver_sql(f"PRAGMA table_info({table.name})")}
+        for column in columns:
+            if column in defaults and defaults[column] is None:
+                # Recreated on every start so the trigger body follows this definition
+                connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {table.name}_{column}_default")
+                connection.exec_driver_sql(
+                    f"CREATE TRIGGER {table.name}_{column}_default AFTER INSERT ON {table.name} "
+                    f"WHEN new.{column} IS NULL BEGIN "
+                    f"UPDATE {table.name} SET {column} = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE rowid = new.rowid; END"
+                )
@@ -4,29 +4,46 @@ MedRAG Backend Server
 Run this script to start the FastAPI server with the integrated RAG system.
 """
 
-import uvicorn
+import importlib.util
 import os
+
+import uvicorn
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+
+def load_server_config() -> dict:
+    """Read and parse all server settings from the environment in one place."""
+    reload = os.getenv("API_RELOAD", "true").lower() == "true"
+    workers = max(int(os.getenv("API_WORKERS", "1")), 1)
+    if reload and workers > 1:
+        # uvicorn cannot combine the reloader with multiple worker processes
+        print("⚠️  API_WORKERS is ignored while API_RELOAD is enabled")
+        workers = 1
+    return {
+        "host": os.getenv("API_HOST", "0.0.0.0"),
+        "port": int(os.getenv("API_PORT", "8000")),
+        "reload": reload,
+        "workers": workers,
+        "log_level": os.getenv("LOG_LEVEL", "info").lower(),
+        # C-backed event loop and HTTP parser from uvicorn[standard]; uvloop is not available on Windows
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "h11",
+        "backlog": 2048,
+    }
+
+
 if __name__ == "__main__":
     # Get configuration from environment
-    host = os.getenv("API_HOST", "0.0.0.0")
-    port = int(os.getenv("API_PORT", "8000"))
-    reload = os.getenv("API_RELOAD", "true").lower() == "true"
-    log_level = os.getenv("LOG_LEVEL", "info").lower()
+    config = load_server_config()
+    host, port, reload = config["host"], config["port"], config["reload"]
     
     print("🏥 Starting MedRAG Backend Server...")
     print(f"📍 Server: http://{host}:{port}")
     print(f"📚 API Docs: http://{host}:{port}/docs")
     print(f"🔧 Environment: {'Development' if reload else 'Production'}")
+    print(f"👷 Workers: {config['workers']}")
     
-    uvicorn.run(
-        "app.main:app",
-        host=host,
-        port=port,
-        reload=reload,
-        log_level=log_level
-    )
\ No newline at end of file
+    uvicorn.run("app.main:app", **config)
\ No newline at end of file
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from app.core.text_splitter import RegexTextSplitter
+
+
+def _sample_text(seed: int = 1) -> str:
+    rng = random.Random(seed)
+    words = ["policy", "leave", "annual", "employee", "benefits", "IT", "laptop", "VPN", "handbook"]
+    paragraphs = []
+    for _ in range(40):
+        sentences = [
+            " ".join(rng.choice(words) for _ in range(rng.randint(3, 25)))
+            for _ in range(rng.randint(1, 8))
+        ]
+        paragraphs.append(". ".join(sentences) + ".")
+    return "\n\n".join(paragraphs)
+
+
+def _chunk_spans(text, chunks):
+    """Locate each chunk in the text, in order; every chunk must be a verbatim slice."""
+    spans, search_from = [], 0
+    for chunk in chunks:
+        start = text.find(chunk, search_from)
+        assert start != -1, f"chunk not found in order: {chunk[:40]!r}"
+        spans.append((start, start + len(chunk)))
+        search_from = start + 1
+    return spans
+
+
+@pytest.mark.parametrize("chunk_size,overlap", [(500, 100), (200, 50), (80, 0)])
+def test_chunks_respect_size_and_cover_text(chunk_size, overlap):
+    text = _sample_text()
+    chunks = RegexTextSplitter(chunk_size=chunk_size, chunk_overlap=overlap).split_text(text)
+
+    assert chunks
+    assert all(0 < len(c) <= chunk_size for c in chunks)
+
+    # No text is dropped: every non-whitespace character falls inside some chunk
+    covered = [False] * len(text)
+    for start, end in _chunk_spans(text, chunks):
+        covered[start:end] = [True] * (end - start)
+    assert all(covered[i] for i, ch in enumerate(text) if not ch.isspace())
+
+
+def test_consecutive_chunks_overlap():
+    text = _sample_text(seed=2)
+    chunks = RegexTextSplitter(chunk_size=500, chunk_overlap=100).split_text(text)
+    spans = _chunk_spans(text, chunks)
+
+    for (prev_start, prev_end), (start, end) in zip(spans, spans[1:]):
+        # Each chunk starts inside the previous one (by at most the overlap) and adds new text
+        assert prev_start < start < prev_end
+        assert prev_end - start <= 100
+        assert end > prev_end
+
+
+def test_makes_progress_without_separators():
+    chunks = RegexTextSplitter(chunk_size=500, chunk_overlap=100).split_text("a" * 1300)
+
+    assert [len(c) for c in chunks] == [500, 500, 300]
+    assert "".join(chunks) == "a" * 1300
+
+
+@pytest.mark.parametrize("text", ["", "   ", "\n\n\n"])
+def test_empty_input(text):
+    assert RegexTextSplitter().split_text(text) == []
+
+
+def test_short_text_is_one_chunk():
+    assert RegexTextSplitter().split_text("  Remote work: up to 3 days a week.  ") == [
+        "Remote work: up to 3 days a week."
+    ]
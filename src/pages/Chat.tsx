@@ -307,23 +307,7 @@ const Chat = () => {
         : "";
 
       addMessage(`${data.answer}${sourcesSuffix}`, "bot");
-
-      // Log analytics (best-effort)
-      try {
-        await fetch(`${API_BASE}/api/analytics/log-query`, {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({
-            query: message,
-            response_time: undefined,
-            success: true,
-            tokens_used: data.tokens_used ?? 0,
-            sources_count: Array.isArray(data.sources) ? data.sources.length : 0,
-          }),
-        });
-      } catch (_) {
-        // ignore analytics errors
-      }
+      // Analytics are recorded server-side by /api/chat/query
       return;
     } catch (err: any) {
       setIsTyping(false);
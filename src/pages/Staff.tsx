@@ -94,6 +94,18 @@ const Staff = () => {
     }
   };
 
+  // Uploads are processed in the background; poll the job until it finishes
+  const waitForIngestJob = async (job: { job_id: string; status: string; chunks_created?: number; error?: string }) => {
+    while (job.status === "processing") {
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+      const res = await fetch(`${API_BASE}/api/documents/jobs/${job.job_id}`);
+      if (!res.ok) throw new Error(`Job status failed: ${res.status}`);
+      job = await res.json();
+    }
+    if (job.status !== "processed") throw new Error(job.error || "Document processing failed");
+    return job;
+  };
+
   const handleFileUpload = async (event: React.ChangeEvent<HTMLInputElement>) => {
     const file = event.target.files?.[0];
     if (file) {
@@ -105,7 +117,7 @@ const Staff = () => {
           body: formData,
         });
         if (!res.ok) throw new Error(`Upload failed: ${res.status}`);
-        const data = await res.json();
+        const data = await waitForIngestJob(await res.json());
         toast({ title: "Document processed", description: `${file.name} indexed (${data.chunks_created} chunks)` });
         await loadDocuments();
       } catch (err: any) {